@@ -14,13 +14,14 @@
 
 import os
 import logging
-import json
 import uuid
-import asyncio
+from contextlib import asynccontextmanager
 from typing import Dict, Any, Optional
 
-import requests
-from fastapi import FastAPI, HTTPException
+import httpx
+import orjson
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 import uvicorn
 from a2a.types import (
     SendMessageRequest,
@@ -38,8 +39,22 @@ logger = logging.getLogger(__name__)
 # Get config from environment variables
 GENAL_TOOLBOX_URL = os.environ.get("GENAL_TOOLBOX_SERVICE_URL", "http://genal-toolbox-service")
 
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    yield
+    if actuator_service is not None:
+        await actuator_service.close()
+
+
 # Create FastAPI app for A2A server functionality
-app = FastAPI(title="Actuator Agent A2A Server")
+app = FastAPI(
+    title="Actuator Agent A2A Server",
+    default_response_class=ORJSONResponse,
+    lifespan=_lifespan,
+)
+
+_HEALTH_RESPONSE_BODY = orjson.dumps({"status": "healthy", "service": "actuator_agent"})
 
 # Global actuator service instance
 actuator_service = None
@@ -92,21 +107,35 @@ class ActuatorService:
     def __init__(self):
         logger.info("Initializing ActuatorService...")
         self.genal_toolbox_url = GENAL_TOOLBOX_URL
+        self.toolbox_client = httpx.AsyncClient(base_url=self.genal_toolbox_url, timeout=30.0)
+        # Supported actions, resolved with a single lookup per command
+        self._action_handlers = {
+            "lock_account": self._lock_account,
+        }
         logger.info("ActuatorService initialized.")
 
-    def call_genai_toolbox_api(self, tool_name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def close(self) -> None:
+        """Release pooled toolbox connections."""
+        await self.toolbox_client.aclose()
+
+    async def call_genai_toolbox_api(self, tool_name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Invoke a GenAI Toolbox tool via its REST API."""
-        url = f"{self.genal_toolbox_url}/api/tool/{tool_name}/invoke"
         try:
-            response = requests.post(
-                url,
+            response = await self.toolbox_client.post(
+                f"/api/tool/{tool_name}/invoke",
                 json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=30,
             )
 
             if response.status_code == 200:
-                result = response.json()
+                try:
+                    result = orjson.loads(response.content)
+                except orjson.JSONDecodeError as error:
+                    logger.error(
+                        "Failed to parse JSON response from genai-toolbox: %s",
+                        str(error),
+                    )
+                    return {"error": "invalid_response", "details": str(error)}
+
                 if isinstance(result, dict):
                     if "data" in result:
                         data = result["data"]
@@ -119,8 +148,8 @@ class ActuatorService:
 
                     if isinstance(data, str):
                         try:
-                            data = json.loads(data)
-                        except json.JSONDecodeError as error:
+                            data = orjson.loads(data)
+                        except orjson.JSONDecodeError as error:
                             logger.error(
                                 "Failed to parse JSON response from genai-toolbox: %s",
                                 str(error),
@@ -144,7 +173,7 @@ class ActuatorService:
             except ValueError:
                 error_body = {"message": response.text}
             return {"error": "http_error", "details": error_body}
-        except requests.RequestException as error:
+        except httpx.HTTPError as error:
             logger.error("Error calling genai-toolbox API: %s", str(error))
             return {"error": "request_failed", "details": str(error)}
 
@@ -157,47 +186,50 @@ class ActuatorService:
             logger.error("Missing 'action' in command data.")
             return {"status": "error", "message": "Missing 'action' in command"}
 
-        if action == "lock_account":
-            account_id = _extract_account_id(command_data)
-            if not account_id:
-                logger.error("Missing 'account_id' for lock_account action.")
-                return {
-                    "status": "error",
-                    "message": "Missing 'account_id' for lock_account action",
-                }
-
-            ext_user_id = _strip_str(command_data.get("ext_user_id"))
-
-            logger.info("Executing lock_account tool for account_id: %s", account_id)
-            response = await asyncio.to_thread(
-                self.call_genai_toolbox_api,
-                "lock_account",
-                {"account_id": account_id},
-            )
+        handler = self._action_handlers.get(action)
+        if handler is None:
+            logger.warning("Unknown action received: %s", action)
+            return {"status": "error", "message": f"Unknown action: {action}"}
+        return await handler(command_data)
+
+    async def _lock_account(self, command_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Lock the account named in the command via the lock_account tool."""
+        account_id = _extract_account_id(command_data)
+        if not account_id:
+            logger.error("Missing 'account_id' for lock_account action.")
+            return {
+                "status": "error",
+                "message": "Missing 'account_id' for lock_account action",
+            }
 
-            if isinstance(response, dict) and response.get("error"):
-                logger.error(
-                    "Error executing lock_account for account_id %s: %s",
-                    account_id,
-                    response,
-                )
-                return {
-                    "status": "error",
-                    "message": "Failed to lock account",
-                    "details": response,
-                }
+        ext_user_id = _strip_str(command_data.get("ext_user_id"))
+
+        logger.info("Executing lock_account tool for account_id: %s", account_id)
+        response = await self.call_genai_toolbox_api(
+            "lock_account",
+            {"account_id": account_id},
+        )
 
-            logger.info("Successfully locked account for account_id: %s", account_id)
+        if isinstance(response, dict) and response.get("error"):
+            logger.error(
+                "Error executing lock_account for account_id %s: %s",
+                account_id,
+                response,
+            )
             return {
-                "status": "success",
-                "action": action,
-                "account_id": account_id,
-                "ext_user_id": ext_user_id,
-                "response": response,
+                "status": "error",
+                "message": "Failed to lock account",
+                "details": response,
             }
 
-        logger.warning("Unknown action received: %s", action)
-        return {"status": "error", "message": f"Unknown action: {action}"}
+        logger.info("Successfully locked account for account_id: %s", account_id)
+        return {
+            "status": "success",
+            "action": "lock_account",
+            "account_id": account_id,
+            "ext_user_id": ext_user_id,
+            "response": response,
+        }
 
 
 @app.post("/a2a/send-message")
@@ -218,7 +250,8 @@ async def handle_a2a_message(request: SendMessageRequest) -> SendMessageResponse
                             message_text = part.root.text
                             break
 
-        logger.info("Received A2A message: %s", message_text)
+        logger.info("Received A2A message (%d chars)", len(message_text))
+        logger.debug("A2A message text: %s", message_text)
 
         if "execute_action:" in message_text or "action" in message_text:
             try:
@@ -227,12 +260,12 @@ async def handle_a2a_message(request: SendMessageRequest) -> SendMessageResponse
                 else:
                     command_json = message_text
 
-                command_data = json.loads(command_json)
-            except json.JSONDecodeError as error:
+                command_data = orjson.loads(command_json)
+            except orjson.JSONDecodeError as error:
                 logger.error("Failed to parse command data from message: %s", str(error))
                 response_text = TextPart(text=f"Error: Failed to parse command data - {str(error)}")
                 response_message = Message(
-                    message_id=str(uuid.uuid4()),
+                    message_id=uuid.uuid4().hex,
                     role=Role.agent,
                     parts=[response_text],
                 )
@@ -243,9 +276,12 @@ async def handle_a2a_message(request: SendMessageRequest) -> SendMessageResponse
                 return SendMessageResponse(root=success_response)
 
             result = await actuator_service.execute_action(command_data)
-            response_text = TextPart(text=f"Action executed: {json.dumps(result)}")
+            response_text = TextPart(
+                text="Action executed: "
+                + orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS).decode()
+            )
             response_message = Message(
-                message_id=str(uuid.uuid4()),
+                message_id=uuid.uuid4().hex,
                 role=Role.agent,
                 parts=[response_text],
             )
@@ -257,7 +293,7 @@ async def handle_a2a_message(request: SendMessageRequest) -> SendMessageResponse
 
         response_text = TextPart(text="Message received but not recognized as actuator command")
         response_message = Message(
-            message_id=str(uuid.uuid4()),
+            message_id=uuid.uuid4().hex,
             role=Role.agent,
             parts=[response_text],
         )
@@ -297,7 +333,7 @@ async def execute_endpoint(command_data: Dict[str, Any]) -> Dict[str, Any]:
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "service": "actuator_agent"}
+    return Response(content=_HEALTH_RESPONSE_BODY, media_type="application/json")
 
 
 def main():
@@ -309,7 +345,7 @@ def main():
         logger.info("ActuatorAgent service created successfully")
 
         logger.info("Starting A2A server on port 8000...")
-        uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+        uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info", loop="uvloop")
 
     except Exception as error:
         logger.fatal("Failed to start ActuatorAgent: %s", str(error), exc_info=True)
@@ -17,10 +17,15 @@ import logging
 import json
 import uuid
 import asyncio
-import requests
-from typing import Dict, Any
-
-from fastapi import FastAPI, HTTPException
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import httpx
+import orjson
+from typing import Dict, Any, Optional
+
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 import uvicorn
 from google.adk.agents import LlmAgent
 from google.adk.models import Gemini
@@ -36,6 +41,8 @@ logger = logging.getLogger(__name__)
 # Get config from environment variables
 GENAL_TOOLBOX_URL = os.environ.get("GENAL_TOOLBOX_SERVICE_URL", "http://genal-toolbox-service")
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
+USER_DETAILS_CACHE_TTL = float(os.environ.get("USER_DETAILS_CACHE_TTL", 60))
+USER_DETAILS_CACHE_SIZE = int(os.environ.get("USER_DETAILS_CACHE_SIZE", 1024))
 
 INVESTIGATION_PROMPT = """
 You are a financial investigator. Your task is to analyze the provided transaction and user data to assess the risk of fraud.
@@ -44,8 +51,22 @@ Consider the transaction amount, user's transaction history, and any other relev
 Format your response as a JSON object with two keys: "risk_score" and "justification".
 """
 
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    yield
+    if investigation_service is not None:
+        await investigation_service.close()
+
+
 # Create FastAPI app for A2A server functionality
-app = FastAPI(title="Investigation Agent A2A Server")
+app = FastAPI(
+    title="Investigation Agent A2A Server",
+    default_response_class=ORJSONResponse,
+    lifespan=_lifespan,
+)
+
+_HEALTH_RESPONSE_BODY = orjson.dumps({"status": "healthy", "service": "investigation_agent"})
 
 # Global investigation service instance
 investigation_service = None
@@ -54,6 +75,12 @@ class InvestigationService:
     def __init__(self):
         logger.info("Initializing InvestigationService...")
         self.genal_toolbox_url = GENAL_TOOLBOX_URL
+        # One pooled client for all toolbox calls; investigations share its keep-alive connections.
+        self.toolbox_client = httpx.AsyncClient(
+            base_url=self.genal_toolbox_url,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
         self.llm_agent = LlmAgent(
             name="investigation_agent",
             model=Gemini(api_key=GEMINI_API_KEY, model="gemini-2.5-flash"),
@@ -66,16 +93,23 @@ class InvestigationService:
             session_service=self.session_service,
         )
         self.default_user_id = "orchestrator"
+        # LRU of account_id -> (expires_at, user_details); profiles rarely change between alerts.
+        self._user_details_cache: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        # account_id -> in-flight lookup, so concurrent investigations share one toolbox call.
+        self._user_details_inflight: Dict[str, asyncio.Future] = {}
         logger.info("InvestigationService initialized.")
 
-    def call_genai_toolbox_api(self, tool_name: str, payload: dict):
+    async def close(self) -> None:
+        """Release pooled toolbox connections."""
+        await self.toolbox_client.aclose()
+
+    async def call_genai_toolbox_api(self, tool_name: str, payload: dict):
         """Helper method to call genai-toolbox REST API."""
         try:
-            url = f"{self.genal_toolbox_url}/api/tool/{tool_name}/invoke"
-            response = requests.post(url, json=payload, headers={'Content-Type': 'application/json'}, timeout=30)
+            response = await self.toolbox_client.post(f"/api/tool/{tool_name}/invoke", json=payload)
             
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 # Extract data from various possible response formats
                 if isinstance(result, dict):
                     if "data" in result:
@@ -90,68 +124,116 @@ class InvestigationService:
                     # If data is a string, parse it as JSON
                     if isinstance(data, str):
                         try:
-                            data = json.loads(data)
-                        except json.JSONDecodeError as e:
-                            logger.error(f"Failed to parse JSON response from genai-toolbox: {e}")
+                            data = orjson.loads(data)
+                        except orjson.JSONDecodeError as e:
+                            logger.error("Failed to parse JSON response from genai-toolbox: %s", e)
                             return []
                     
                     return data if isinstance(data, list) else [data] if data else []
                 elif isinstance(result, list):
                     return result
                 else:
-                    logger.warning(f"Unexpected response format from genai-toolbox: {result}")
+                    logger.warning("Unexpected response format from genai-toolbox: %s", result)
                     return []
             else:
                 result = response.json() if response.headers.get('content-type') == 'application/json' else {}
                 if "error" in result:
-                    logger.error(f"genai-toolbox API error: {result['error']}")
+                    logger.error("genai-toolbox API error: %s", result['error'])
                     return []
                 else:
-                    logger.error(f"genai-toolbox HTTP error: {response.status_code} - {response.text}")
+                    logger.error("genai-toolbox HTTP error: %s - %s", response.status_code, response.text)
                     return []
         except Exception as e:
-            logger.error(f"Error calling genai-toolbox API: {e}")
+            logger.error("Error calling genai-toolbox API: %s", e)
             return []
 
+    def _get_cached_user_details(self, account_id: str) -> Optional[Any]:
+        """Return cached user details for an account if the entry is still fresh."""
+        entry = self._user_details_cache.get(account_id)
+        if entry is None:
+            return None
+        expires_at, user_details = entry
+        if time.monotonic() >= expires_at:
+            del self._user_details_cache[account_id]
+            return None
+        self._user_details_cache.move_to_end(account_id)
+        return user_details
+
+    def _store_user_details(self, account_id: str, user_details: Any) -> None:
+        """Cache non-empty user details, evicting least recently used entries beyond the size cap."""
+        if not user_details or USER_DETAILS_CACHE_TTL <= 0:
+            return
+        self._user_details_cache[account_id] = (
+            time.monotonic() + USER_DETAILS_CACHE_TTL,
+            user_details,
+        )
+        self._user_details_cache.move_to_end(account_id)
+        while len(self._user_details_cache) > USER_DETAILS_CACHE_SIZE:
+            self._user_details_cache.popitem(last=False)
+
+    async def get_user_details(self, account_id: str) -> Any:
+        """Fetch user details for an account, served from a short-lived cache when possible."""
+        user_details = self._get_cached_user_details(account_id)
+        if user_details is not None:
+            logger.info("Using cached user details for account: %s", account_id)
+            return user_details
+
+        pending = self._user_details_inflight.get(account_id)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_user_details(account_id))
+            self._user_details_inflight[account_id] = pending
+            pending.add_done_callback(
+                lambda _: self._user_details_inflight.pop(account_id, None)
+            )
+        # Shield the shared lookup so one cancelled caller does not cancel it for the others
+        return await asyncio.shield(pending)
+
+    async def _fetch_user_details(self, account_id: str) -> Any:
+        user_details = await self.call_genai_toolbox_api(
+            "get_user_details_by_account",
+            {"account_id": account_id}
+        )
+        self._store_user_details(account_id, user_details)
+        return user_details
+
     async def investigate_transaction(self, transaction_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Receives a transaction, gathers context, uses an LLM to analyze it,
         and returns a structured case file.
         """
-        logger.info(f"Received request to investigate transaction: {transaction_data.get('transaction_id')}")
+        logger.info("Received request to investigate transaction: %s", transaction_data.get('transaction_id'))
         account_id = transaction_data.get("from_account_id")
         if not account_id:
             logger.error("Missing 'from_account_id' in transaction data.")
             return {"error": "Missing from_account_id in transaction data"}
 
         try:
-            logger.info(f"Fetching details for account: {account_id}")
-            # Use REST API calls to genai-toolbox
-            user_details = await asyncio.to_thread(
-                self.call_genai_toolbox_api,
-                "get_user_details_by_account",
-                {"account_id": account_id}
-            )
-            logger.info(f"Fetching transaction history for account: {account_id}")
-            transaction_history = await asyncio.to_thread(
-                self.call_genai_toolbox_api,
-                "get_user_transaction_history",
-                {"account_id": account_id}
+            logger.info("Fetching details and transaction history for account: %s", account_id)
+            # The two genai-toolbox lookups are independent, so issue them concurrently
+            user_details, transaction_history = await asyncio.gather(
+                self.get_user_details(account_id),
+                self.call_genai_toolbox_api(
+                    "get_user_transaction_history",
+                    {"account_id": account_id}
+                ),
             )
         except Exception as e:
-            logger.error(f"Error calling GenAI Toolbox: {e}", exc_info=True)
+            logger.error("Error calling GenAI Toolbox: %s", e, exc_info=True)
             return {"error": f"Failed to gather context: {e}"}
 
+        # Compact JSON: indentation only adds prompt tokens for the model to read
         prompt = (
             "Please investigate the following transaction:\n"
-            f"{json.dumps(transaction_data, indent=2)}\n\n"
+            f"{orjson.dumps(transaction_data).decode()}\n\n"
             "Here is the user's profile:\n"
-            f"{json.dumps(user_details, indent=2)}\n\n"
+            f"{orjson.dumps(user_details).decode()}\n\n"
             "And here is the user's recent transaction history:\n"
-            f"{json.dumps(transaction_history, indent=2)}\n\n"
+            f"{orjson.dumps(transaction_history).decode()}\n\n"
             "Provide your risk assessment as a JSON object."
         )
 
+        user_id = transaction_data.get("from_account_id") or self.default_user_id
+        session_id = uuid.uuid4().hex
         try:
             logger.info("Sending data to LLM for fraud analysis...")
             message_content = types.Content(
@@ -159,8 +241,6 @@ class InvestigationService:
                 parts=[types.Part(text=prompt)],
             )
 
-            user_id = transaction_data.get("from_account_id") or self.default_user_id
-            session_id = str(uuid.uuid4())
             await self.session_service.create_session(
                 app_name=self.runner.app_name,
                 user_id=user_id,
@@ -197,10 +277,17 @@ class InvestigationService:
                 .strip()
             )
             analysis = json.loads(cleaned_response)
-            logger.info(f"Received analysis from LLM: {analysis}")
+            logger.info("Received analysis from LLM: %s", analysis)
         except Exception as e:
-            logger.error(f"Error processing LLM response: {e}", exc_info=True)
+            logger.error("Error processing LLM response: %s", e, exc_info=True)
             return {"error": f"Failed to get analysis from LLM: {e}", "llm_response": str(e)}
+        finally:
+            # Sessions are single-use; remove them so the in-memory store stays bounded
+            await self.session_service.delete_session(
+                app_name=self.runner.app_name,
+                user_id=user_id,
+                session_id=session_id,
+            )
 
         case_file = {
             "transaction_data": transaction_data,
@@ -208,7 +295,7 @@ class InvestigationService:
             "transaction_history": transaction_history,
             "fraud_analysis": analysis,
         }
-        logger.info(f"Case file created for transaction: {transaction_data.get('transaction_id')}")
+        logger.info("Case file created for transaction: %s", transaction_data.get('transaction_id'))
         return case_file
 
 
@@ -233,7 +320,8 @@ async def handle_a2a_message(request: SendMessageRequest) -> SendMessageResponse
                             message_text = part.root.text
                             break
         
-        logger.info(f"Received A2A message: {message_text}")
+        logger.info("Received A2A message (%d chars)", len(message_text))
+        logger.debug("A2A message text: %s", message_text)
         
         # Parse the transaction data from the message
         if "investigate_transaction:" in message_text or "transaction_data" in message_text:
@@ -244,15 +332,18 @@ async def handle_a2a_message(request: SendMessageRequest) -> SendMessageResponse
                 else:
                     transaction_json = message_text
                     
-                transaction_data = json.loads(transaction_json)
+                transaction_data = orjson.loads(transaction_json)
                 
                 # Process the transaction investigation
                 result = await investigation_service.investigate_transaction(transaction_data)
                 
                 # Create proper A2A response message
-                response_text = TextPart(text=f"Investigation completed: {json.dumps(result)}")
+                response_text = TextPart(
+                    text="Investigation completed: "
+                    + orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS).decode()
+                )
                 response_message = Message(
-                    message_id=str(uuid.uuid4()),
+                    message_id=uuid.uuid4().hex,
                     role=Role.agent,
                     parts=[response_text]
                 )
@@ -263,12 +354,12 @@ async def handle_a2a_message(request: SendMessageRequest) -> SendMessageResponse
                     result=response_message
                 )
                 return SendMessageResponse(root=success_response)
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse transaction data from message: {e}")
+            except orjson.JSONDecodeError as e:
+                logger.error("Failed to parse transaction data from message: %s", e)
                 # Create error response
                 response_text = TextPart(text=f"Error: Failed to parse transaction data - {str(e)}")
                 response_message = Message(
-                    message_id=str(uuid.uuid4()),
+                    message_id=uuid.uuid4().hex,
                     role=Role.agent,
                     parts=[response_text]
                 )
@@ -281,7 +372,7 @@ async def handle_a2a_message(request: SendMessageRequest) -> SendMessageResponse
             # Create proper A2A response message for unrecognized messages
             response_text = TextPart(text="Message received but not recognized as investigation request")
             response_message = Message(
-                message_id=str(uuid.uuid4()),
+                message_id=uuid.uuid4().hex,
                 role=Role.agent,
                 parts=[response_text]
             )
@@ -293,7 +384,7 @@ async def handle_a2a_message(request: SendMessageRequest) -> SendMessageResponse
             return SendMessageResponse(root=success_response)
             
     except Exception as e:
-        logger.error(f"Error processing A2A message: {e}", exc_info=True)
+        logger.error("Error processing A2A message: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error processing message: {str(e)}")
 
 
@@ -315,14 +406,14 @@ async def investigate_endpoint(transaction_data: Dict[str, Any]) -> Dict[str, An
         result = await investigation_service.investigate_transaction(transaction_data)
         return result
     except Exception as e:
-        logger.error(f"Error in investigate endpoint: {e}", exc_info=True)
+        logger.error("Error in investigate endpoint: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Investigation failed: {str(e)}")
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "service": "investigation_agent"}
+    return Response(content=_HEALTH_RESPONSE_BODY, media_type="application/json")
 
 
 def main():
@@ -335,10 +426,10 @@ def main():
         
         # Start FastAPI A2A server
         logger.info("Starting A2A server on port 8000...")
-        uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+        uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info", loop="uvloop")
         
     except Exception as e:
-        logger.fatal(f"Failed to start InvestigationAgent: {e}", exc_info=True)
+        logger.fatal("Failed to start InvestigationAgent: %s", e, exc_info=True)
 
 
 if __name__ == "__main__":
@@ -13,14 +13,22 @@
 # limitations under the License.
 
 import os
+import asyncio
+import hashlib
 import logging
 import json
+import random
+import time
 import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from typing import Any, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 import uvicorn
 import httpx
+import orjson
 from a2a.client.legacy import A2AClient
 from a2a.types import (
     JSONRPCErrorResponse,
@@ -37,7 +45,7 @@ from google.adk.agents import LlmAgent
 from google.adk.models import Gemini
 from google.adk.runners import Runner
 from google.adk.sessions.in_memory_session_service import InMemorySessionService
-from google.adk.tools import FunctionTool
+from google.adk.tools import FunctionTool, ToolContext
 from google.genai import types
 
 # Configure logging
@@ -55,6 +63,16 @@ ACTUATOR_AGENT_URL = os.environ.get(
 )
 RISK_SCORE_THRESHOLD = os.environ.get("RISK_SCORE_THRESHOLD", "7")
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
+ORCHESTRATION_CONCURRENCY = int(os.environ.get("ORCHESTRATION_CONCURRENCY", 8))
+A2A_DELEGATE_CONCURRENCY = int(os.environ.get("A2A_DELEGATE_CONCURRENCY", 16))
+A2A_SEND_ATTEMPTS = int(os.environ.get("A2A_SEND_ATTEMPTS", 3))
+A2A_RETRY_BASE_DELAY = float(os.environ.get("A2A_RETRY_BASE_DELAY", 0.1))
+A2A_RETRY_MAX_DELAY = float(os.environ.get("A2A_RETRY_MAX_DELAY", 2.0))
+A2A_BREAKER_FAILURE_THRESHOLD = int(os.environ.get("A2A_BREAKER_FAILURE_THRESHOLD", 5))
+A2A_BREAKER_RESET_TIMEOUT = float(os.environ.get("A2A_BREAKER_RESET_TIMEOUT", 30))
+ORCHESTRATION_FAST_PATH = os.environ.get("ORCHESTRATION_FAST_PATH", "false").lower() == "true"
+ALERT_RESULT_CACHE_TTL = float(os.environ.get("ALERT_RESULT_CACHE_TTL", 60))
+ALERT_RESULT_CACHE_SIZE = int(os.environ.get("ALERT_RESULT_CACHE_SIZE", 4096))
 
 ORCHESTRATOR_PROMPT_TEMPLATE = """
 You are Vigil Orchestrator, the command agent coordinating fraud investigations for Bank of Anthos.
@@ -70,13 +88,69 @@ Do not send alternative keys such as "command". Avoid repeated actuator calls af
 # Cache for downstream A2A clients keyed by agent label.
 _client_registry: dict[str, A2AClient] = {}
 
+# Connection pool shared by every downstream A2A client, created on first use.
+_a2a_http_client: httpx.AsyncClient | None = None
+
+# In-flight call limits per downstream agent, keyed like _client_registry.
+_delegate_semaphores: dict[str, asyncio.Semaphore] = {}
+
+
+class _CircuitBreaker:
+    """Stop calling a downstream agent after repeated failures, probing again after a cooldown.
+
+    Once the cooldown has passed the breaker is half-open and admits a single
+    probe; its outcome closes or reopens the breaker. A probe that never
+    reports back is replaced by another one after a further cooldown.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.half_open = False
+
+    def allow_request(self) -> bool:
+        if self.opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self.opened_at < self.reset_timeout:
+            return False
+        # Admit this caller as the probe and restart the cooldown so the rest keep failing fast
+        self.half_open = True
+        self.opened_at = now
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.half_open = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.half_open or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self.half_open = False
+
+
+# Circuit breakers per downstream agent, keyed like _client_registry.
+_delegate_breakers: dict[str, _CircuitBreaker] = {}
+
+# Message prefixes the downstream A2A handlers look for, including the separating space
+_INVESTIGATION_MESSAGE_PREFIX = "investigate_transaction: "
+_ACTUATOR_MESSAGE_PREFIX = "execute_action: "
+
+# Prefixes of alert messages sent by the transaction monitor
+_ALERT_BATCH_MESSAGE_PREFIX = "Process transaction alerts: "
+_ALERT_MESSAGE_PREFIX = "Process transaction alert: "
+
 _TOOL_LABELS = {
     "delegate_to_investigation_agent": "InvestigationAgent",
     "delegate_to_actuator_agent": "ActuatorAgent",
 }
 
-
-_latest_case_file: Any | None = None
+# Session state key holding the latest investigation case file for the alert being orchestrated
+_CASE_FILE_STATE_KEY = "latest_case_file"
 
 
 def _human_tool_name(raw_name: str) -> str:
@@ -90,6 +164,23 @@ def _extract_tool_response(tool_events: list[dict[str, Any]], tool_label: str) -
     return None
 
 
+def _get_shared_http_client() -> httpx.AsyncClient:
+    """Return the pooled HTTP client used for all downstream A2A calls."""
+    global _a2a_http_client
+    if _a2a_http_client is None:
+        # Keep idle connections open between alerts so delegations skip the
+        # TCP handshake; a short connect timeout fails fast when a service is down.
+        _a2a_http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=75.0,
+            ),
+        )
+    return _a2a_http_client
+
+
 def _get_or_create_client(cache_key: str, url: str) -> A2AClient | None:
     """Return a cached A2A client or create a new one for the target URL."""
     client = _client_registry.get(cache_key)
@@ -97,8 +188,7 @@ def _get_or_create_client(cache_key: str, url: str) -> A2AClient | None:
         return client
 
     try:
-        httpx_client = httpx.AsyncClient(timeout=30.0)
-        client = A2AClient(httpx_client=httpx_client, url=url)
+        client = A2AClient(httpx_client=_get_shared_http_client(), url=url)
         _client_registry[cache_key] = client
         logger.info("Created A2A client for %s at %s", cache_key, url)
         return client
@@ -129,23 +219,18 @@ def _extract_text_from_message(message: Message) -> str:
 
 
 def _maybe_extract_json_payload(raw_text: str) -> Any | None:
-    """Attempt to parse JSON content from an agent text response."""
-    candidates: list[str] = []
-    normalized = raw_text.strip()
-    if normalized:
-        candidates.append(normalized)
-        colon_index = normalized.find(":")
-        if colon_index != -1 and colon_index + 1 < len(normalized):
-            candidates.append(normalized[colon_index + 1 :].strip())
+    """Attempt to parse JSON content from an agent text response.
 
-    for candidate in candidates:
-        if not candidate:
-            continue
-        try:
-            return json.loads(candidate)
-        except json.JSONDecodeError:
-            continue
-    return None
+    Agents reply with a short label followed by JSON (e.g. "Investigation
+    completed: {...}"), so parse once from the first object or array.
+    """
+    starts = [index for index in (raw_text.find("{"), raw_text.find("[")) if index != -1]
+    if not starts:
+        return None
+    try:
+        return orjson.loads(raw_text[min(starts):])
+    except orjson.JSONDecodeError:
+        return None
 
 
 def _format_agent_result(agent_label: str, response: SendMessageResponse) -> dict[str, Any]:
@@ -166,14 +251,12 @@ def _format_agent_result(agent_label: str, response: SendMessageResponse) -> dic
     result = root.result
     if isinstance(result, Message):
         text_content = _extract_text_from_message(result)
-        payload: dict[str, Any] = {
-            "agent": agent_label,
-            "raw_message": text_content,
-        }
         parsed = _maybe_extract_json_payload(text_content)
+        # Keep the text only when it could not be parsed; otherwise it duplicates
+        # the case file in every tool event the model and the response carry.
         if parsed is not None:
-            payload["data"] = parsed
-        return payload
+            return {"agent": agent_label, "data": parsed}
+        return {"agent": agent_label, "raw_message": text_content}
 
     if isinstance(result, Task):
         return {
@@ -184,24 +267,29 @@ def _format_agent_result(agent_label: str, response: SendMessageResponse) -> dic
     return {"agent": agent_label, "result": result}
 
 
+def _dumps(value: Any) -> str:
+    """Serialize a JSON-compatible value to a compact string using orjson."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 def _normalize_payload(payload: Any, agent_label: str) -> str | None:
     """Ensure payload is valid JSON and return it as a string."""
     if isinstance(payload, (dict, list, int, float, bool)) or payload is None:
-        return json.dumps(payload)
+        return _dumps(payload)
     if isinstance(payload, str):
         candidate = payload.strip()
         if not candidate:
-            return json.dumps({})
+            return "{}"
         try:
-            parsed = json.loads(candidate)
-        except json.JSONDecodeError:
+            parsed = orjson.loads(candidate)
+        except orjson.JSONDecodeError:
             logger.warning(
                 "Payload provided to %s delegate is not valid JSON: %s",
                 agent_label,
                 payload,
             )
             return None
-        return json.dumps(parsed)
+        return _dumps(parsed)
 
     logger.warning("Unsupported payload type %s for %s delegate", type(payload), agent_label)
     return None
@@ -374,15 +462,21 @@ def _coerce_to_dict(raw_command: Any) -> tuple[Optional[dict[str, Any]], Optiona
     return None, "Actuator command must be valid JSON after sanitization."
 
 
-def _prepare_actuator_payload(raw_command: Any) -> tuple[Optional[dict[str, Any]], Optional[str]]:
-    """Normalize LLM-provided actuator command payload."""
+def _prepare_actuator_payload(
+    raw_command: Any, fallback_case_file: Any = None
+) -> tuple[Optional[dict[str, Any]], Optional[str]]:
+    """Normalize LLM-provided actuator command payload.
+
+    `fallback_case_file` is used when the command omits `case_file`; it must come
+    from the same alert's investigation.
+    """
     payload, error = _coerce_to_dict(raw_command)
     if payload is None:
         return None, error
 
     case_file = payload.get("case_file")
-    if case_file is None and _latest_case_file is not None:
-        case_file = _latest_case_file
+    if case_file is None:
+        case_file = fallback_case_file
     account_id = payload.get("account_id") or payload.get("from_account_id")
     ext_user_id = payload.get("ext_user_id") or payload.get("user_id")
 
@@ -390,7 +484,6 @@ def _prepare_actuator_payload(raw_command: Any) -> tuple[Optional[dict[str, Any]
         account_id = _extract_account_id(case_file)
     if ext_user_id is None and isinstance(case_file, dict):
         ext_user_id = _extract_ext_user_id(case_file)
-        account_id = _extract_account_id(case_file)
     if account_id is None and ext_user_id is not None:
         account_id = ext_user_id
 
@@ -416,6 +509,62 @@ def _prepare_actuator_payload(raw_command: Any) -> tuple[Optional[dict[str, Any]
     return normalized, None
 
 
+def _make_text_message(role: Role, text: str) -> Message:
+    """Build a single-part text Message with a fresh ID."""
+    return Message(message_id=uuid.uuid4().hex, role=role, parts=[TextPart(text=text)])
+
+
+def _agent_reply(request_id: Any, text: str) -> SendMessageResponse:
+    """Wrap reply text in the A2A success response for the given request."""
+    return SendMessageResponse(
+        root=SendMessageSuccessResponse(id=request_id, result=_make_text_message(Role.agent, text))
+    )
+
+
+def _is_connect_error(exc: BaseException) -> bool:
+    """Return True if the call failed before the request reached the agent."""
+    # A2AClient wraps transport errors, so walk the cause chain for the httpx error
+    while exc is not None:
+        if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout)):
+            return True
+        exc = exc.__cause__
+    return False
+
+
+async def _send_with_retry(
+    client: A2AClient,
+    request: SendMessageRequest,
+    agent_label: str,
+    semaphore: asyncio.Semaphore,
+) -> SendMessageResponse:
+    """Send an A2A request, retrying connection failures with jittered exponential backoff.
+
+    Only connection failures are retried, so an investigation or account lock
+    that reached the agent is never sent twice. The per-agent slot is held only
+    while a request is in flight, not during the backoff.
+    """
+    for attempt in range(1, A2A_SEND_ATTEMPTS + 1):
+        try:
+            async with semaphore:
+                return await client.send_message(request)
+        except Exception as exc:
+            if attempt == A2A_SEND_ATTEMPTS or not _is_connect_error(exc):
+                raise
+            # Full jitter keeps concurrent callers from reconnecting in lockstep
+            delay = random.uniform(
+                0, min(A2A_RETRY_MAX_DELAY, A2A_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+            )
+            logger.warning(
+                "Could not reach %s (attempt %d/%d): %s. Retrying in %.2fs",
+                agent_label,
+                attempt,
+                A2A_SEND_ATTEMPTS,
+                exc,
+                delay,
+            )
+            await asyncio.sleep(delay)
+
+
 async def _delegate_via_a2a(
     *,
     agent_label: str,
@@ -436,49 +585,67 @@ async def _delegate_via_a2a(
             "error": "Provided payload is not valid JSON",
         }
 
-    message = Message(
-        message_id=str(uuid.uuid4()),
-        role=Role.user,
-        parts=[TextPart(text=f"{payload_prefix} {payload_json}")],
-    )
+    message = _make_text_message(Role.user, payload_prefix + payload_json)
     request = SendMessageRequest(
-        id=str(uuid.uuid4()),
+        id=uuid.uuid4().hex,
         params=MessageSendParams(message=message),
     )
 
+    breaker = _delegate_breakers.get(cache_key)
+    if breaker is None:
+        breaker = _delegate_breakers[cache_key] = _CircuitBreaker(
+            A2A_BREAKER_FAILURE_THRESHOLD, A2A_BREAKER_RESET_TIMEOUT
+        )
+    if not breaker.allow_request():
+        logger.warning("Circuit open for %s; skipping call.", agent_label)
+        return {"agent": agent_label, "error": f"{agent_label} is unavailable (circuit open)"}
+
+    semaphore = _delegate_semaphores.get(cache_key)
+    if semaphore is None:
+        semaphore = _delegate_semaphores[cache_key] = asyncio.Semaphore(A2A_DELEGATE_CONCURRENCY)
+
     try:
-        response = await client.send_message(request)
+        response = await _send_with_retry(client, request, agent_label, semaphore)
     except Exception as exc:  # pragma: no cover - network failure path
+        breaker.record_failure()
         logger.error("Error while calling %s: %s", agent_label, exc, exc_info=True)
         return {"agent": agent_label, "error": str(exc)}
 
+    breaker.record_success()
     return _format_agent_result(agent_label, response)
 
 
-async def delegate_to_investigation_agent(transaction_details: Any) -> dict[str, Any]:
+async def delegate_to_investigation_agent(
+    transaction_details: Any, tool_context: Optional[ToolContext] = None
+) -> dict[str, Any]:
     """Delegates the investigation of a suspicious transaction to the InvestigationAgent."""
     logger.info("Delegating to InvestigationAgent with transaction payload.")
     result = await _delegate_via_a2a(
         agent_label="InvestigationAgent",
         cache_key="investigation_agent",
         service_url=INVESTIGATION_AGENT_URL,
-        payload_prefix="investigate_transaction:",
+        payload_prefix=_INVESTIGATION_MESSAGE_PREFIX,
         payload=transaction_details,
     )
-    if isinstance(result, dict) and result.get("data") is not None:
-        global _latest_case_file
-        _latest_case_file = result["data"]
+    if tool_context is not None and isinstance(result, dict) and result.get("data") is not None:
+        # Kept in the alert's own session so concurrent alerts never see each other's case file
+        tool_context.state[_CASE_FILE_STATE_KEY] = result["data"]
     return result
 
 
-async def delegate_to_actuator_agent(action_command: Any) -> dict[str, Any]:
+async def delegate_to_actuator_agent(
+    action_command: Any, tool_context: Optional[ToolContext] = None
+) -> dict[str, Any]:
     """Send a lock_account command to the ActuatorAgent via A2A.
 
     Expects JSON containing `action`, `account_id`, `ext_user_id` (optional), `reason`,
     and optionally `case_file`. The `account_id` field is required by the GenAI toolbox.
     """
     logger.info("Delegating to ActuatorAgent with command payload.")
-    normalized_payload, error = _prepare_actuator_payload(action_command)
+    fallback_case_file = (
+        tool_context.state.get(_CASE_FILE_STATE_KEY) if tool_context is not None else None
+    )
+    normalized_payload, error = _prepare_actuator_payload(action_command, fallback_case_file)
     if error:
         logger.error("Actuator command validation failed: %s", error)
         return {
@@ -489,7 +656,7 @@ async def delegate_to_actuator_agent(action_command: Any) -> dict[str, Any]:
         agent_label="ActuatorAgent",
         cache_key="actuator_agent",
         service_url=ACTUATOR_AGENT_URL,
-        payload_prefix="execute_action:",
+        payload_prefix=_ACTUATOR_MESSAGE_PREFIX,
         payload=normalized_payload,
     )
 
@@ -497,8 +664,25 @@ async def delegate_to_actuator_agent(action_command: Any) -> dict[str, Any]:
 investigation_tool = FunctionTool(delegate_to_investigation_agent)
 actuator_tool = FunctionTool(delegate_to_actuator_agent)
 
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    yield
+    global _a2a_http_client
+    if _a2a_http_client is not None:
+        await _a2a_http_client.aclose()
+        _a2a_http_client = None
+    _client_registry.clear()
+
+
 # Create FastAPI app for A2A server functionality
-app = FastAPI(title="Orchestrator Agent A2A Server")
+app = FastAPI(
+    title="Orchestrator Agent A2A Server",
+    default_response_class=ORJSONResponse,
+    lifespan=_lifespan,
+)
+
+_HEALTH_RESPONSE_BODY = orjson.dumps({"status": "healthy", "service": "orchestrator_agent"})
 
 # Global orchestrator service instance
 orchestrator_service = None
@@ -522,10 +706,25 @@ class OrchestratorService:
 
         self.risk_threshold = threshold
         self.default_user_id = "transaction-monitor"
+        # Shared across requests so concurrent alert batches cannot together
+        # overload Gemini or the downstream agents.
+        self.orchestration_semaphore = asyncio.Semaphore(ORCHESTRATION_CONCURRENCY)
+        # Completed results keyed by transaction digest, so redelivered alerts skip Gemini.
+        self._alert_result_cache: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._alert_inflight: dict[bytes, asyncio.Future] = {}
 
         instruction = ORCHESTRATOR_PROMPT_TEMPLATE.format(
             threshold=f"{self.risk_threshold:.2f}"
         )
+        # Everything in the per-alert message except the transaction is fixed, so build it once.
+        self._alert_prompt_prefix = (
+            "Transaction alert received.\n"
+            f"Risk threshold: {self.risk_threshold:.2f}\n"
+            "Analyze the details, call InvestigationAgent first, and escalate only when warranted.\n"
+            "When invoking ActuatorAgent, use JSON of the form {\"action\": \"lock_account\", \"account_id\": \"...\", \"ext_user_id\": \"...\", \"reason\": \"...\"}.\n"
+            "Do not use alternate field names such as 'command'.\n"
+            "Transaction JSON:\n"
+        )
 
         self.llm_agent = LlmAgent(
             name="orchestrator_agent",
@@ -549,16 +748,131 @@ class OrchestratorService:
             self.risk_threshold,
         )
 
+    async def _run_fast_pipeline(self, transaction_data: dict) -> Optional[dict]:
+        """Investigate and, at or above the risk threshold, lock the account without the LLM.
+
+        Returns None when the investigation does not yield a risk score, so the
+        caller can fall back to the Gemini-driven flow.
+        """
+        if not transaction_data.get("from_account_id"):
+            return None
+
+        investigation_result = await delegate_to_investigation_agent(transaction_data)
+        case_file = investigation_result.get("data") if isinstance(investigation_result, dict) else None
+        risk_score = _extract_risk_score(case_file)
+        if risk_score is None:
+            logger.info(
+                "Fast path could not score transaction %s; falling back to the orchestration LLM.",
+                transaction_data.get("transaction_id"),
+            )
+            return None
+
+        tool_events: list[dict[str, Any]] = [
+            {
+                "event": "call",
+                "tool": "InvestigationAgent",
+                "args": transaction_data,
+                "note": "fast_path",
+            },
+            {
+                "event": "response",
+                "tool": "InvestigationAgent",
+                "response": investigation_result,
+                "note": "fast_path",
+            },
+        ]
+        justification = _extract_justification(case_file)
+        account_id = _extract_account_id(case_file)
+        ext_user_id = _extract_ext_user_id(case_file)
+        actuator_result = None
+        should_actuate = False
+
+        if risk_score >= self.risk_threshold:
+            actuator_payload: dict[str, Any] = {
+                "action": "lock_account",
+                "reason": (
+                    f"Risk score {risk_score:.2f} on transaction "
+                    f"{transaction_data.get('transaction_id')}"
+                ),
+                "case_file": case_file,
+            }
+            if account_id:
+                actuator_payload["account_id"] = account_id
+            if ext_user_id:
+                actuator_payload["ext_user_id"] = ext_user_id
+
+            tool_events.append(
+                {
+                    "event": "call",
+                    "tool": "ActuatorAgent",
+                    "args": actuator_payload,
+                    "note": "fast_path",
+                }
+            )
+            actuator_result = await delegate_to_actuator_agent(actuator_payload)
+            tool_events.append(
+                {
+                    "event": "response",
+                    "tool": "ActuatorAgent",
+                    "response": actuator_result,
+                    "note": "fast_path",
+                }
+            )
+            should_actuate = isinstance(actuator_result, dict) and not actuator_result.get("error")
+            outcome = "account locked" if should_actuate else f"account lock failed: {actuator_result}"
+            summary = (
+                f"Risk score {risk_score:.2f} meets threshold {self.risk_threshold:.2f}; {outcome}."
+            )
+        else:
+            summary = (
+                f"Risk score {risk_score:.2f} is below threshold {self.risk_threshold:.2f}; "
+                "no action taken."
+            )
+        if justification:
+            summary = f"{summary}\nJustification: {justification}"
+
+        logger.info(
+            "Fast-path orchestration completed for transaction %s. should_actuate=%s",
+            transaction_data.get("transaction_id"),
+            should_actuate,
+        )
+
+        response_payload: dict[str, Any] = {
+            "status": "completed",
+            "summary": summary,
+            "user_id": transaction_data.get("from_account_id"),
+            "risk_threshold": self.risk_threshold,
+            "risk_score": risk_score,
+            "tool_events": tool_events,
+            "investigation_result": investigation_result,
+            "should_actuate": should_actuate,
+        }
+        if justification:
+            response_payload["justification"] = justification
+        if account_id:
+            response_payload["account_id"] = account_id
+        if ext_user_id:
+            response_payload["ext_user_id"] = ext_user_id
+        if actuator_result is not None:
+            response_payload["actuator_result"] = actuator_result
+        return response_payload
+
     async def process_transaction_alert(self, transaction_data: dict) -> dict:
         """Run the Gemini-backed orchestration flow for a transaction alert."""
-        logger.info("Received transaction alert: %s", transaction_data)
+        logger.info("Received transaction alert: %s", transaction_data.get("transaction_id"))
+        logger.debug("Transaction alert payload: %s", transaction_data)
+
+        if ORCHESTRATION_FAST_PATH:
+            result = await self._run_fast_pipeline(transaction_data)
+            if result is not None:
+                return result
 
         user_id = (
             transaction_data.get("from_account_id")
             or transaction_data.get("user_id")
             or self.default_user_id
         )
-        session_id = str(uuid.uuid4())
+        session_id = uuid.uuid4().hex
 
         await self.session_service.create_session(
             app_name=self.runner.app_name,
@@ -571,27 +885,22 @@ class OrchestratorService:
         last_text = ""
         account_id: Optional[str] = None
 
-        message_text = (
-            "Transaction alert received.\n"
-            f"Risk threshold: {self.risk_threshold:.2f}\n"
-            "Analyze the details, call InvestigationAgent first, and escalate only when warranted.\n"
-            "When invoking ActuatorAgent, use JSON of the form {\"action\": \"lock_account\", \"account_id\": \"...\", \"ext_user_id\": \"...\", \"reason\": \"...\"}.\n"
-            "Do not use alternate field names such as 'command'.\n"
-            f"Transaction JSON:\n{json.dumps(transaction_data, indent=2)}"
-        )
+        message_text = self._alert_prompt_prefix + _dumps(transaction_data)
         message_content = types.Content(
             role="user",
             parts=[types.Part(text=message_text)],
         )
 
         try:
+            # Runner yields ADK Event objects, which always provide these accessors
+            add_tool_event = tool_events.append
             async for event in self.runner.run_async(
                 user_id=user_id,
                 session_id=session_id,
                 new_message=message_content,
             ):
-                for call in getattr(event, "get_function_calls", lambda: [])() or []:
-                    tool_events.append(
+                for call in event.get_function_calls():
+                    add_tool_event(
                         {
                             "event": "call",
                             "tool": _human_tool_name(call.name),
@@ -599,8 +908,8 @@ class OrchestratorService:
                         }
                     )
 
-                for response in getattr(event, "get_function_responses", lambda: [])() or []:
-                    tool_events.append(
+                for response in event.get_function_responses():
+                    add_tool_event(
                         {
                             "event": "response",
                             "tool": _human_tool_name(response.name),
@@ -608,15 +917,13 @@ class OrchestratorService:
                         }
                     )
 
-                if getattr(event, "content", None) and getattr(event.content, "parts", None):
-                    text_segments = []
-                    for part in event.content.parts:
-                        if getattr(part, "text", None):
-                            text_segments.append(part.text.strip())
+                content = event.content
+                if content is not None and content.parts:
+                    text_segments = [part.text.strip() for part in content.parts if part.text]
                     if text_segments:
                         last_text = "\n".join(filter(None, text_segments))
 
-                if getattr(event, "is_final_response", None) and event.is_final_response():
+                if event.is_final_response():
                     final_text = last_text
 
         except Exception as exc:  # pragma: no cover - defensive logging
@@ -632,6 +939,13 @@ class OrchestratorService:
                 "user_id": user_id,
                 "tool_events": tool_events,
             }
+        finally:
+            # Each alert gets a fresh session; drop it so the in-memory store does not grow per alert
+            await self.session_service.delete_session(
+                app_name=self.runner.app_name,
+                user_id=user_id,
+                session_id=session_id,
+            )
 
         summary = final_text or last_text or "No summary produced by orchestrator."
 
@@ -781,6 +1095,99 @@ class OrchestratorService:
 
         return response_payload
 
+    def _get_cached_alert_result(self, cache_key: bytes) -> Optional[dict]:
+        """Return the cached result for an identical alert if the entry is still fresh."""
+        entry = self._alert_result_cache.get(cache_key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del self._alert_result_cache[cache_key]
+            return None
+        self._alert_result_cache.move_to_end(cache_key)
+        return result
+
+    def _is_cacheable_result(self, result: dict) -> bool:
+        """Return True if a result is final: the account was locked or the risk was below threshold.
+
+        Failed locks and unscored alerts are not cached, so a redelivered alert retries them.
+        """
+        if result.get("status") != "completed":
+            return False
+        if result.get("should_actuate"):
+            return True
+        risk_score = result.get("risk_score")
+        return risk_score is not None and risk_score < self.risk_threshold
+
+    def _store_alert_result(self, cache_key: bytes, result: dict) -> None:
+        """Cache a final result, evicting least recently used entries beyond the size cap."""
+        if ALERT_RESULT_CACHE_TTL <= 0 or not self._is_cacheable_result(result):
+            return
+        self._alert_result_cache[cache_key] = (
+            time.monotonic() + ALERT_RESULT_CACHE_TTL,
+            result,
+        )
+        self._alert_result_cache.move_to_end(cache_key)
+        while len(self._alert_result_cache) > ALERT_RESULT_CACHE_SIZE:
+            self._alert_result_cache.popitem(last=False)
+
+    async def handle_transaction_alert(self, transaction_data: dict) -> dict:
+        """Orchestrate a transaction alert while holding a concurrency slot.
+
+        Alerts identical to one already in flight share its result, and alerts
+        identical to one that finished within ALERT_RESULT_CACHE_TTL seconds are
+        answered from the cache; neither takes a slot.
+        """
+        cache_key = hashlib.blake2b(
+            orjson.dumps(transaction_data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        ).digest()
+        cached = self._get_cached_alert_result(cache_key)
+        if cached is not None:
+            logger.info(
+                "Using cached result for duplicate transaction alert: %s",
+                transaction_data.get("transaction_id"),
+            )
+            return {**cached, "cached": True}
+
+        pending = self._alert_inflight.get(cache_key)
+        if pending is not None:
+            logger.info(
+                "Joining in-flight orchestration for duplicate transaction alert: %s",
+                transaction_data.get("transaction_id"),
+            )
+            # Shield the shared run so one cancelled caller does not cancel it for the others
+            result = await asyncio.shield(pending)
+            return {**result, "cached": True}
+
+        pending = asyncio.ensure_future(self._orchestrate_and_cache(cache_key, transaction_data))
+        self._alert_inflight[cache_key] = pending
+        pending.add_done_callback(lambda _: self._alert_inflight.pop(cache_key, None))
+        return await asyncio.shield(pending)
+
+    async def _orchestrate_and_cache(self, cache_key: bytes, transaction_data: dict) -> dict:
+        async with self.orchestration_semaphore:
+            result = await self.process_transaction_alert(transaction_data)
+        self._store_alert_result(cache_key, result)
+        return result
+
+    async def process_transaction_alerts(self, transactions: list[Any]) -> list[dict]:
+        """Orchestrate a batch of transaction alerts concurrently, preserving input order."""
+        results = await asyncio.gather(
+            *(self.handle_transaction_alert(tx) for tx in transactions),
+            return_exceptions=True,
+        )
+        processed: list[dict] = []
+        for transaction, result in zip(transactions, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "Failed to process transaction alert %s: %s",
+                    transaction.get("transaction_id") if isinstance(transaction, dict) else None,
+                    result,
+                )
+                result = {"status": "error", "summary": str(result)}
+            processed.append(result)
+        return processed
+
 
 # A2A FastAPI endpoints
 @app.post("/a2a/send-message")
@@ -792,58 +1199,39 @@ async def handle_a2a_message(request: SendMessageRequest) -> SendMessageResponse
         raise HTTPException(status_code=500, detail="Orchestrator service not initialized")
     
     try:
-        # Extract message text from A2A message parts
+        # Extract the first text part; FastAPI has already validated the request shape
         message_text = ""
-        if hasattr(request, 'params') and request.params:
-            if hasattr(request.params, 'message') and request.params.message:
-                if hasattr(request.params.message, 'parts') and request.params.message.parts:
-                    for part in request.params.message.parts:
-                        # Part has a 'root' attribute containing the TextPart
-                        if hasattr(part, 'root') and hasattr(part.root, 'text'):
-                            message_text = part.root.text
-                            break
+        for part in request.params.message.parts:
+            text = getattr(part.root, "text", None)
+            if text is not None:
+                message_text = text
+                break
         
-        logger.info(f"Received A2A message: {message_text}")
+        logger.info("Received A2A message (%d chars)", len(message_text))
+        logger.debug("A2A message text: %s", message_text)
         
         # Parse the transaction data from the message
-        if "Process transaction alert:" in message_text:
-            transaction_json = message_text.replace("Process transaction alert: ", "")
-            transaction_data = json.loads(transaction_json)
+        if message_text.startswith(_ALERT_BATCH_MESSAGE_PREFIX):
+            transactions = orjson.loads(message_text[len(_ALERT_BATCH_MESSAGE_PREFIX):])
+            if not isinstance(transactions, list):
+                raise ValueError("Transaction alert batch must be a JSON array")
+
+            results = await orchestrator_service.process_transaction_alerts(transactions)
+
+            return _agent_reply(request.id, "Transaction alerts processed: " + _dumps(results))
+        elif message_text.startswith(_ALERT_MESSAGE_PREFIX):
+            transaction_data = orjson.loads(message_text[len(_ALERT_MESSAGE_PREFIX):])
             
             # Process the transaction alert
-            result = await orchestrator_service.process_transaction_alert(transaction_data)
-            
-            # Create proper A2A response message
-            response_text = TextPart(text=f"Transaction alert processed: {json.dumps(result)}")
-            response_message = Message(
-                message_id=str(uuid.uuid4()),
-                role=Role.agent,
-                parts=[response_text]
-            )
-            
-            # Return proper A2A success response
-            success_response = SendMessageSuccessResponse(
-                id=request.id,
-                result=response_message
-            )
-            return SendMessageResponse(root=success_response)
+            result = await orchestrator_service.handle_transaction_alert(transaction_data)
+            return _agent_reply(request.id, "Transaction alert processed: " + _dumps(result))
         else:
-            # Create proper A2A response message for unrecognized messages
-            response_text = TextPart(text="Message received but not recognized as transaction alert")
-            response_message = Message(
-                message_id=str(uuid.uuid4()),
-                role=Role.agent,
-                parts=[response_text]
-            )
-            
-            success_response = SendMessageSuccessResponse(
-                id=request.id,
-                result=response_message
+            return _agent_reply(
+                request.id, "Message received but not recognized as transaction alert"
             )
-            return SendMessageResponse(root=success_response)
             
     except Exception as e:
-        logger.error(f"Error processing A2A message: {e}", exc_info=True)
+        logger.error("Error processing A2A message: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error processing message: {str(e)}")
 
 
@@ -855,7 +1243,7 @@ async def handle_root_a2a_message(request: SendMessageRequest) -> SendMessageRes
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "service": "orchestrator_agent"}
+    return Response(content=_HEALTH_RESPONSE_BODY, media_type="application/json")
 
 
 def main():
@@ -868,10 +1256,10 @@ def main():
         
         # Start FastAPI A2A server
         logger.info("Starting A2A server on port 8000...")
-        uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+        uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info", loop="uvloop")
         
     except Exception as e:
-        logger.fatal(f"Failed to start OrchestratorAgent: {e}", exc_info=True)
+        logger.fatal("Failed to start OrchestratorAgent: %s", e, exc_info=True)
 
 
 if __name__ == "__main__":
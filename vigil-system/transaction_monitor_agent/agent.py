@@ -14,10 +14,11 @@
 
 import os
 import time
+import random
 import asyncio
 from datetime import datetime, timezone
 import logging
-import json
+import orjson
 import requests
 from a2a.client.legacy import A2AClient
 from a2a.types import (
@@ -33,6 +34,7 @@ from a2a.types import (
 )
 import httpx
 import uuid
+import uvloop
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -42,7 +44,45 @@ logger = logging.getLogger(__name__)
 GENAL_TOOLBOX_URL = os.environ.get("GENAL_TOOLBOX_SERVICE_URL", "http://genal-toolbox-service")
 ORCHESTRATOR_URL = os.environ.get("ORCHESTRATOR_SERVICE_URL", "http://orchestrator-agent-service")
 POLL_INTERVAL = int(os.environ.get("POLL_INTERVAL", 5))
+MIN_POLL_INTERVAL = int(os.environ.get("MIN_POLL_INTERVAL", 1))
+MAX_POLL_INTERVAL = int(os.environ.get("MAX_POLL_INTERVAL", 30))
 FRAUD_THRESHOLD = float(os.environ.get("FRAUD_THRESHOLD", 1000.0))
+ALERT_QUEUE_SIZE = int(os.environ.get("ALERT_QUEUE_SIZE", 4))
+ALERT_CONCURRENCY = int(os.environ.get("ALERT_CONCURRENCY", 8))
+ALERT_BATCH_SIZE = int(os.environ.get("ALERT_BATCH_SIZE", 10))
+SEEN_TRANSACTIONS_GENERATION_SIZE = int(os.environ.get("SEEN_TRANSACTIONS_GENERATION_SIZE", 65536))
+ALERT_SEND_ATTEMPTS = int(os.environ.get("ALERT_SEND_ATTEMPTS", 3))
+ALERT_RETRY_BASE_DELAY = float(os.environ.get("ALERT_RETRY_BASE_DELAY", 0.1))
+ALERT_RETRY_MAX_DELAY = float(os.environ.get("ALERT_RETRY_MAX_DELAY", 2.0))
+ALERT_REPLY_TIMEOUT = float(os.environ.get("ALERT_REPLY_TIMEOUT", 300.0))
+
+# Prefix the orchestrator expects in front of a JSON array of flagged transactions
+ALERT_MESSAGE_PREFIX = "Process transaction alerts: "
+
+def _parse_timestamp(value: str) -> datetime | None:
+    """Parse an ISO 8601 timestamp, treating naive values as UTC."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _is_connect_error(exc: BaseException) -> bool:
+    """Return True if the request failed before reaching the orchestrator.
+
+    The A2A client wraps transport errors, so the original httpx exception is
+    looked up on the cause chain. Only connection failures are matched: the
+    alert was never delivered, so resending it cannot duplicate work.
+    """
+    while exc is not None:
+        if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout)):
+            return True
+        exc = exc.__cause__
+    return False
+
 
 class TransactionMonitorAgent:
     """
@@ -53,32 +93,122 @@ class TransactionMonitorAgent:
     def __init__(self) -> None:
         logger.info("Initializing TransactionMonitorAgent...")
         self.genal_toolbox_url = GENAL_TOOLBOX_URL
+        # Reuse one keep-alive connection pool for every poll of the toolbox.
+        self.toolbox_session = requests.Session()
+        self.toolbox_session.headers.update({'Content-Type': 'application/json'})
+        self.new_transactions_url = f"{self.genal_toolbox_url}/api/tool/get_new_transactions/invoke"
         self.orchestrator_client = None  # Lazy initialization
+        self.orchestrator_http_client: httpx.AsyncClient | None = None
         self.last_processed_timestamp = datetime.now(timezone.utc).isoformat()
+        # Two rotating generations of seen transaction IDs guard against rows that
+        # are returned again at the timestamp boundary, with bounded memory.
+        self._seen_active: set[str] = set()
+        self._seen_previous: set[str] = set()
+        # Batches of flagged transactions waiting to be sent to the orchestrator.
+        # Bounded so a slow orchestrator applies backpressure to polling.
+        self.alert_queue: asyncio.Queue[list[dict]] = asyncio.Queue(maxsize=ALERT_QUEUE_SIZE)
+        # Caps in-flight orchestrator alert messages across polls; the dispatcher
+        # takes a slot before starting each delivery.
+        self.alert_semaphore = asyncio.Semaphore(ALERT_CONCURRENCY)
+        # Delivery tasks still running, referenced here so they are not garbage collected.
+        self._alert_tasks: set[asyncio.Task] = set()
         logger.info("TransactionMonitorAgent initialized.")
 
+    async def close(self) -> None:
+        """Cancel pending alert deliveries and release pooled HTTP connections."""
+        for task in self._alert_tasks:
+            task.cancel()
+        await asyncio.gather(*self._alert_tasks, return_exceptions=True)
+        self.toolbox_session.close()
+        if self.orchestrator_http_client is not None:
+            await self.orchestrator_http_client.aclose()
+
     async def run(self) -> None:
         """The main loop of the agent."""
-        logger.info(f"Starting transaction monitoring loop (poll interval: {POLL_INTERVAL}s)...")
+        logger.info("Starting transaction monitoring loop (poll interval: %ss)...", POLL_INTERVAL)
+        await asyncio.gather(self.poll_transactions(), self.dispatch_alerts())
+
+    async def poll_transactions(self) -> None:
+        """Poll the ledger and queue flagged transactions, independent of alert delivery.
+
+        The interval halves while transactions are flowing and grows by
+        POLL_INTERVAL per idle poll, bounded by MIN/MAX_POLL_INTERVAL. It is
+        measured from the start of each poll, so slow fetches do not stretch it.
+        While the toolbox keeps failing, polls back off exponentially instead.
+        """
+        loop = asyncio.get_running_loop()
+        interval = POLL_INTERVAL
+        failures = 0
         while True:
-            await self.process_new_transactions()
-            await asyncio.sleep(POLL_INTERVAL)
+            started = loop.time()
+            found = await self.process_new_transactions()
+            if found is None:
+                failures += 1
+                backoff = min(MAX_POLL_INTERVAL, interval * 2 ** failures)
+                # Jitter so replicas recovering from the same outage do not poll in lockstep
+                delay = backoff / 2 + random.uniform(0, backoff / 2)
+                logger.warning(
+                    "Fetching transactions failed %d times in a row; next poll in %.1fs.",
+                    failures,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                continue
+            failures = 0
 
-    def get_new_transactions_via_genai_toolbox(self, last_timestamp: str):
-        """Get new transactions via genai-toolbox REST API."""
+            if found:
+                next_interval = max(MIN_POLL_INTERVAL, interval // 2)
+            else:
+                next_interval = min(MAX_POLL_INTERVAL, interval + POLL_INTERVAL)
+            if next_interval != interval:
+                logger.debug("Poll interval changed from %ss to %ss", interval, next_interval)
+                interval = next_interval
+
+            delay = started + interval - loop.time()
+            if delay < 0:
+                logger.warning(
+                    "Polling cycle overran the %ss interval by %.2fs; polling again immediately.",
+                    interval,
+                    -delay,
+                )
+                delay = 0
+            await asyncio.sleep(delay)
+
+    async def dispatch_alerts(self) -> None:
+        """Send queued batches of flagged transactions to the orchestrator.
+
+        Each ALERT_BATCH_SIZE chunk is delivered by its own task, so a slow
+        orchestration does not hold up alerts from later polls. A queued batch
+        is marked done once all of its chunks have been delivered.
+
+        A task is started only after taking an alert_semaphore slot, so at most
+        ALERT_CONCURRENCY messages are in flight across all polls. While every
+        slot is busy the queue is not drained, and polling blocks once it fills.
+        """
+        while True:
+            batch = await self.alert_queue.get()
+            tasks = []
+            for start in range(0, len(batch), ALERT_BATCH_SIZE):
+                await self.alert_semaphore.acquire()
+                task = asyncio.create_task(self._bounded_alert(batch[start:start + ALERT_BATCH_SIZE]))
+                self._alert_tasks.add(task)
+                task.add_done_callback(self._alert_tasks.discard)
+                tasks.append(task)
+            delivered = asyncio.gather(*tasks, return_exceptions=True)
+            delivered.add_done_callback(lambda _: self.alert_queue.task_done())
+
+    def get_new_transactions_via_genai_toolbox(self, last_timestamp: str) -> list | None:
+        """Get new transactions via genai-toolbox REST API, or None if the call failed."""
         try:
             # Call genai-toolbox using the correct REST API endpoint
-            url = f"{self.genal_toolbox_url}/api/tool/get_new_transactions/invoke"
-            
-            # REST API request payload
-            payload = {
-                "last_timestamp": last_timestamp
-            }
-            
-            response = requests.post(url, json=payload, headers={'Content-Type': 'application/json'}, timeout=30)
+            response = self.toolbox_session.post(
+                self.new_transactions_url,
+                json={"last_timestamp": last_timestamp},
+                timeout=30,
+            )
             
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 # genai-toolbox returns results in various formats, typically with data or rows
                 if isinstance(result, dict):
                     # Extract transaction data from various possible response formats
@@ -95,65 +225,137 @@ class TransactionMonitorAgent:
                     # If data is a string, parse it as JSON
                     if isinstance(data, str):
                         try:
-                            data = json.loads(data)
-                        except json.JSONDecodeError as e:
-                            logger.error(f"Failed to parse JSON response from genai-toolbox: {e}")
-                            return []
+                            data = orjson.loads(data)
+                        except orjson.JSONDecodeError as e:
+                            logger.error("Failed to parse JSON response from genai-toolbox: %s", e)
+                            return None
                     
                     return data if isinstance(data, list) else []
                 elif isinstance(result, list):
                     return result
                 else:
-                    logger.warning(f"Unexpected response format from genai-toolbox: {result}")
+                    logger.warning("Unexpected response format from genai-toolbox: %s", result)
                     return []
             else:
                 result = response.json() if response.headers.get('content-type') == 'application/json' else {}
                 if "error" in result:
-                    logger.error(f"genai-toolbox API error: {result['error']}")
-                    # If it's a database schema issue, continue with simulation mode
-                    if "does not exist" in result["error"]:
-                        logger.info("Database schema issue detected, falling back to simulation mode")
-                        return []
+                    logger.error("genai-toolbox API error: %s", result["error"])
                 else:
-                    logger.error(f"genai-toolbox HTTP error: {response.status_code} - {response.text}")
-                return []
+                    logger.error("genai-toolbox HTTP error: %s - %s", response.status_code, response.text)
+                return None
         except Exception as e:
-            logger.error(f"Error calling genai-toolbox API: {e}")
-            return []
+            logger.error("Error calling genai-toolbox API: %s", e)
+            return None
+
+    @staticmethod
+    def _validate_transactions(rows: list) -> list[dict]:
+        """Drop rows that cannot be processed, logging them once per batch."""
+        valid = []
+        invalid_count = 0
+        for row in rows:
+            if (
+                not isinstance(row, dict)
+                or row.get("transaction_id") is None
+                or not isinstance(row.get("timestamp"), str)
+            ):
+                invalid_count += 1
+                continue
+            try:
+                float(row.get("amount", 0))
+            except (TypeError, ValueError):
+                invalid_count += 1
+                continue
+            valid.append(row)
+
+        if invalid_count:
+            logger.warning("Skipping %d malformed transaction rows from genai-toolbox.", invalid_count)
+        return valid
 
-    async def process_new_transactions(self) -> None:
-        """Fetches and processes new transactions."""
-        logger.info(f"Fetching new transactions since {self.last_processed_timestamp}...")
+    def _mark_seen(self, transaction_id: str) -> bool:
+        """Record a transaction ID, returning False if it was already processed."""
+        if transaction_id in self._seen_active or transaction_id in self._seen_previous:
+            return False
+        if len(self._seen_active) >= SEEN_TRANSACTIONS_GENERATION_SIZE:
+            self._seen_previous = self._seen_active
+            self._seen_active = set()
+        self._seen_active.add(transaction_id)
+        return True
+
+    async def _bounded_alert(self, transactions: list[dict]) -> None:
+        """Alert the orchestrator, then release the slot the dispatcher took for it."""
         try:
-            # Use genai-toolbox REST API to get new transactions
-            transactions = self.get_new_transactions_via_genai_toolbox(self.last_processed_timestamp)
+            await self.alert_orchestrator(transactions)
+        finally:
+            self.alert_semaphore.release()
+
+    async def process_new_transactions(self) -> int | None:
+        """Fetches and processes new transactions, returning how many had not been seen before.
+
+        Returns None if the transactions could not be fetched.
+        """
+        logger.info("Fetching new transactions since %s...", self.last_processed_timestamp)
+        try:
+            # Use genai-toolbox REST API to get new transactions. The call is blocking,
+            # so run it in a worker thread to keep alert delivery moving meanwhile.
+            rows = await asyncio.to_thread(
+                self.get_new_transactions_via_genai_toolbox,
+                self.last_processed_timestamp,
+            )
+            if rows is None:
+                return None
+            transactions = self._validate_transactions(rows)
              
             if not transactions:
                 logger.info("No new transactions found.")
-                # Simulation disabled to avoid synthetic alerts in production environments.
-                return
+                return 0
              
-            logger.info(f"Found {len(transactions)} new transactions.")
+            logger.info("Found %d new transactions.", len(transactions))
              
             latest_timestamp = self.last_processed_timestamp
-            alert_tasks = []  # Collect alert tasks to run concurrently
+            latest_parsed = _parse_timestamp(latest_timestamp)
+            flagged_transactions = []
+            # Bind per-row lookups to locals; this loop runs for every polled row.
+            mark_seen = self._mark_seen
+            flag = flagged_transactions.append
+            new_count = 0
             
             for tx in transactions:
-                if float(tx.get("amount", 0)) > FRAUD_THRESHOLD:
-                    logger.warning(f"High-value transaction detected: {tx['transaction_id']} for amount {tx['amount']}. Alerting orchestrator.")
-                    alert_tasks.append(self.alert_orchestrator(tx))
+                transaction_id = tx["transaction_id"]
+                if not mark_seen(str(transaction_id)):
+                    continue
+                new_count += 1
+
+                amount = float(tx.get("amount", 0))
+                if amount > FRAUD_THRESHOLD:
+                    logger.warning(
+                        "High-value transaction detected: %s for amount %s. Alerting orchestrator.",
+                        transaction_id,
+                        amount,
+                    )
+                    flag(tx)
              
-                if tx["timestamp"] > latest_timestamp:
+                # Compare as datetimes: the watermark and ledger rows may differ in
+                # offset notation and fractional precision, which breaks string ordering.
+                tx_parsed = _parse_timestamp(tx["timestamp"])
+                if tx_parsed is not None and latest_parsed is not None:
+                    is_newer = tx_parsed > latest_parsed
+                else:
+                    is_newer = tx["timestamp"] > latest_timestamp
+                if is_newer:
                     latest_timestamp = tx["timestamp"]
+                    latest_parsed = tx_parsed
              
-            # Execute all alerts concurrently
-            if alert_tasks:
-                await asyncio.gather(*alert_tasks, return_exceptions=True)
+            # Hand off to the alert dispatcher so the next poll is not held up by orchestration
+            if flagged_transactions:
+                await self.alert_queue.put(flagged_transactions)
              
             self.last_processed_timestamp = latest_timestamp
+            # Rows re-returned at the timestamp boundary are not new activity
+            return new_count
 
         except Exception as e:
-            logger.error(f"Error processing new transactions: {e}", exc_info=True)
+            logger.error("Error processing new transactions: %s", e, exc_info=True)
+            return None
 
     @staticmethod
     def _extract_message_text(message: Message) -> str:
@@ -186,57 +388,120 @@ class TransactionMonitorAgent:
 
         return repr(result_payload)
 
+    @staticmethod
+    def _summarize_alert_results(transactions: list[dict], reply_text: str) -> str:
+        """Summarize a batch reply as transaction_id, status and risk_score per alert."""
+        # The orchestrator replies with a label followed by a JSON array in input order
+        start = reply_text.find("[")
+        try:
+            results = orjson.loads(reply_text[start:]) if start != -1 else None
+        except orjson.JSONDecodeError:
+            results = None
+        if not isinstance(results, list):
+            return f"unrecognized reply ({len(reply_text)} chars)"
+
+        summaries = []
+        for transaction, result in zip(transactions, results):
+            if not isinstance(result, dict):
+                result = {}
+            summaries.append(
+                f"{transaction['transaction_id']} status={result.get('status')} "
+                f"risk_score={result.get('risk_score')}"
+            )
+        return "; ".join(summaries)
+
+    async def _send_with_retry(self, message_request: SendMessageRequest) -> SendMessageResponse:
+        """Send an A2A request, retrying connection failures with jittered backoff."""
+        for attempt in range(1, ALERT_SEND_ATTEMPTS + 1):
+            try:
+                return await self.orchestrator_client.send_message(message_request)
+            except Exception as e:
+                if attempt == ALERT_SEND_ATTEMPTS or not _is_connect_error(e):
+                    raise
+                # Full jitter keeps concurrent senders from reconnecting in lockstep
+                delay = random.uniform(
+                    0, min(ALERT_RETRY_MAX_DELAY, ALERT_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+                )
+                logger.warning(
+                    "Could not reach orchestrator (attempt %d/%d): %s. Retrying in %.2fs",
+                    attempt,
+                    ALERT_SEND_ATTEMPTS,
+                    e,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+
     def create_orchestrator_client(self):
         """Create A2A client for orchestrator communication."""
         try:
-            # Create legacy A2A client with httpx
-            httpx_client = httpx.AsyncClient(timeout=httpx.Timeout(60.0))
+            # Create legacy A2A client with httpx. Keep idle connections alive across
+            # polling cycles so consecutive alerts reuse them instead of reconnecting.
+            # The pool matches alert_semaphore: every in-flight alert gets a connection
+            # and none is opened that the semaphore would leave idle.
+            # A batch reply waits for every alert in it to be orchestrated, so reads
+            # get their own, much longer timeout.
+            httpx_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(60.0, read=ALERT_REPLY_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=ALERT_CONCURRENCY,
+                    max_keepalive_connections=ALERT_CONCURRENCY,
+                    keepalive_expiry=max(30.0, MAX_POLL_INTERVAL * 2),
+                ),
+            )
             client = A2AClient(
                 httpx_client=httpx_client,
                 url=f"{ORCHESTRATOR_URL}"
             )
-            logger.info(f"Created A2A client for orchestrator at {ORCHESTRATOR_URL}/a2a")
+            self.orchestrator_http_client = httpx_client
+            logger.info("Created A2A client for orchestrator at %s/a2a", ORCHESTRATOR_URL)
             return client
         except Exception as e:
-            logger.error(f"Failed to create A2A client: {e}")
+            logger.error("Failed to create A2A client: %s", e)
             return None
 
-    async def alert_orchestrator(self, transaction: dict) -> None:
-        """Sends a transaction alert to the orchestrator agent via A2A protocol."""
+    async def alert_orchestrator(self, transactions: list[dict]) -> None:
+        """Sends a batch of transaction alerts to the orchestrator agent in one A2A message."""
+        transaction_ids = ", ".join(str(tx["transaction_id"]) for tx in transactions)
         try:
             # Lazy initialization of client
             if self.orchestrator_client is None:
                 self.orchestrator_client = self.create_orchestrator_client()
             
             if self.orchestrator_client is None:
-                logger.warning(f"No A2A client available, skipping alert for transaction: {transaction['transaction_id']}")
+                logger.warning(
+                    "No A2A client available, skipping alerts for transactions: %s",
+                    transaction_ids,
+                )
                 return
             
-            logger.info(f"Sending A2A alert for transaction: {transaction['transaction_id']}")
-            logger.info(f"Transaction details: amount={transaction.get('amount')}, to_account={transaction.get('to_account_id')}")
+            logger.info(
+                "Sending A2A alert for %d transactions: %s",
+                len(transactions),
+                transaction_ids,
+            )
             
             # Create properly formatted A2A message request for the orchestrator
             text_part = TextPart(
-                text=f"Process transaction alert: {json.dumps(transaction)}"
+                text=ALERT_MESSAGE_PREFIX + orjson.dumps(transactions).decode()
             )
             message_content = Message(
-                message_id=str(uuid.uuid4()),
+                message_id=uuid.uuid4().hex,
                 role=Role.user,
                 parts=[text_part]
             )
             message_params = MessageSendParams(message=message_content)
             message_request = SendMessageRequest(
-                id=1,
+                id=uuid.uuid4().hex,
                 params=message_params
             )
             
             # Send A2A message to orchestrator
-            response = await self.orchestrator_client.send_message(message_request)
+            response = await self._send_with_retry(message_request)
 
             if not isinstance(response, SendMessageResponse):
                 logger.error(
-                    "Unexpected orchestrator response type for transaction %s: %s",
-                    transaction["transaction_id"],
+                    "Unexpected orchestrator response type for transactions %s: %s",
+                    transaction_ids,
                     type(response),
                 )
                 return
@@ -244,8 +509,8 @@ class TransactionMonitorAgent:
             root_payload = response.root
             if isinstance(root_payload, JSONRPCErrorResponse):
                 logger.error(
-                    "Orchestrator returned JSON-RPC error for transaction %s: %s",
-                    transaction["transaction_id"],
+                    "Orchestrator returned JSON-RPC error for transactions %s: %s",
+                    transaction_ids,
                     root_payload.error,
                 )
                 return
@@ -257,29 +522,44 @@ class TransactionMonitorAgent:
 
             if payload is None:
                 logger.error(
-                    "Orchestrator response missing result for transaction %s",
-                    transaction["transaction_id"],
+                    "Orchestrator response missing result for transactions %s",
+                    transaction_ids,
                 )
                 return
 
-            summary = self._format_success_payload(payload)
+            reply_text = self._format_success_payload(payload)
             logger.info(
-                "Successfully sent alert for transaction %s. Orchestrator response: %s",
-                transaction["transaction_id"],
-                summary,
+                "Successfully sent alert for transactions %s. Results: %s",
+                transaction_ids,
+                self._summarize_alert_results(transactions, reply_text),
+            )
+            logger.debug(
+                "Orchestrator response for transactions %s: %s",
+                transaction_ids,
+                reply_text,
             )
 
         except Exception as e:
-            logger.error(f"Failed to alert orchestrator for transaction {transaction['transaction_id']}: {e}", exc_info=True)
+            logger.error(
+                "Failed to alert orchestrator for transactions %s: %s",
+                transaction_ids,
+                e,
+                exc_info=True,
+            )
 
 
 async def main() -> None:
     """Entry point for the agent."""
+    agent = None
     try:
         agent = TransactionMonitorAgent()
         await agent.run()
     except Exception as e:
-        logger.fatal(f"Failed to start TransactionMonitorAgent: {e}", exc_info=True)
+        logger.fatal("Failed to start TransactionMonitorAgent: %s", e, exc_info=True)
+    finally:
+        if agent is not None:
+            await agent.close()
 
 if __name__ == "__main__":
+    uvloop.install()
     asyncio.run(main())